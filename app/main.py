@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Depends
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.auth.api import router as auth_router
 from app.modules.chat.api import router as chat_router
@@ -12,6 +13,8 @@ from app.modules.dashboard.api import router as dashboard_router
 from app.modules.subscription.api import router as subscription_router
 from app.modules.payment.api import router as payment_router
 from app.core.database import db_manager
+from app.modules.chat.together_service import together_service
+from app.modules.payment.service import ipaymu_service
 from app.utils.activity_logger import log_activity 
 from app.core.dependencies import get_db 
 from app.core.global_error_handler import register_global_exception_handlers 
@@ -21,7 +24,9 @@ from app.core.config import settings
 app = FastAPI(
     title="Multi-Tenant Company Chatbot API",
     description="A SaaS platform for company-specific AI chatbots using RAG and Database Integration.",
-    version="1.0.0"
+    version="1.0.0",
+    # Render JSON responses with orjson; UUIDs and datetimes in schemas need no fallback encoder.
+    default_response_class=ORJSONResponse,
 )
 
 # Mount static files directory
@@ -32,9 +37,18 @@ register_global_exception_handlers(app)
 # The RAGService, S3Client, and DBEngine are initialized on import now.
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connections on shutdown."""
-    await db_manager.close()
-    print("Database engine closed.")
+    """Close database connections and shared HTTP clients on shutdown."""
+    # Close each resource independently so one failure does not leak the others.
+    for name, close in (
+        ("Database engine", db_manager.close),
+        ("Together HTTP client", together_service.close),
+        ("iPaymu HTTP client", ipaymu_service.close),
+    ):
+        try:
+            await close()
+            print(f"{name} closed.")
+        except Exception as e:
+            print(f"Failed to close {name}: {e}")
 
 app.add_middleware(
     CORSMiddleware,
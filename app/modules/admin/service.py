@@ -1,3 +1,4 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import joinedload
@@ -433,7 +434,7 @@ async def update_company_by_superadmin_service(
         if payload.admin_name:
             target_admin.name = payload.admin_name
         if payload.admin_password:
-            target_admin.hashed_password = get_password_hash(payload.admin_password)
+            target_admin.hashed_password = await asyncio.to_thread(get_password_hash, payload.admin_password)
         if admin_profile_picture_file and admin_profile_picture_file.filename:
             UPLOAD_DIR = "static/admin_profiles"
             new_profile_picture_url = await save_uploaded_file(admin_profile_picture_file, UPLOAD_DIR)
@@ -472,7 +473,7 @@ async def update_company_admin_by_superadmin_service(
     if payload.username:
         admin.username = payload.username
     if payload.password:
-        admin.hashed_password = get_password_hash(payload.password)
+        admin.hashed_password = await asyncio.to_thread(get_password_hash, payload.password)
 
     db.add(admin)
     await db.commit()
@@ -501,7 +502,7 @@ async def update_superadmin_profile_service(
         superadmin.email = payload.email
 
     if payload.password:
-        superadmin.password = get_password_hash(payload.password)
+        superadmin.password = await asyncio.to_thread(get_password_hash, payload.password)
 
     db.add(superadmin)
     await db.commit()
@@ -573,7 +574,7 @@ async def create_company_by_superadmin_service(
     admin_user = user_model.Users(
         name=payload.admin_name,
         username=payload.company_email,
-        password=get_password_hash(payload.password),
+        password=await asyncio.to_thread(get_password_hash, payload.password),
         role="admin",
         company_id=company.id,
     )
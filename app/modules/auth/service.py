@@ -1,3 +1,4 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
@@ -47,7 +48,7 @@ async def register_user(db: AsyncSession, user_data: user_schema.UserRegistratio
     if existing_user_by_username:
         raise UserRegistrationError("Username is already registered.")
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     
     # Business Logic: New Company Registration
     if user_data.company_name:
@@ -122,7 +123,7 @@ async def register_employee_by_admin(db: AsyncSession, employee_data: user_schem
         if existing_user_by_email:
             raise UserRegistrationError("Email is already registered.")
 
-    hashed_password = get_password_hash(employee_data.password)
+    hashed_password = await asyncio.to_thread(get_password_hash, employee_data.password)
 
     profile_picture_url = None
     if profile_picture_file and profile_picture_file.filename:
@@ -198,7 +199,7 @@ async def update_employee_by_admin(
     update_data = employee_data.model_dump(exclude_unset=True)
 
     if "password" in update_data and update_data["password"]:
-        update_data["password"] = get_password_hash(update_data["password"])
+        update_data["password"] = await asyncio.to_thread(get_password_hash, update_data["password"])
 
     if profile_picture_file and profile_picture_file.filename:
         UPLOAD_DIR = "static/employee_profiles"
@@ -262,7 +263,7 @@ async def authenticate_user(
         if user and user.role == "admin":
             return None
     
-    if not user or not verify_password(password, user.password):
+    if not user or not await asyncio.to_thread(verify_password, password, user.password):
         return None
 
     # Superadmin bypasses active checks
@@ -420,7 +421,7 @@ async def reset_password(db: AsyncSession, email: str, token: str, new_password:
         )
 
     # Hash dan update password
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await asyncio.to_thread(get_password_hash, new_password)
     user.password = hashed_password
 
     # Hapus token dan expiry setelah reset berhasil
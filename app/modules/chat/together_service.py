@@ -3,17 +3,37 @@ from datetime import date
 from typing import Optional, AsyncGenerator, List
 
 import httpx
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models import user_model, company_model
 
+# Built once for the shared client. Streamed completions can run for a while, so reads get 60s,
+# but waiting for a free pooled connection is capped at 5s and reported as "busy" instead.
+# The pool keeps httpx's default ceiling of 100 concurrent connections.
+HTTP_TIMEOUT = httpx.Timeout(60, pool=5)
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
 
 class TogetherService:
     def __init__(self):
         self.api_key = settings.TOGETHER_API_KEY
         self.model = settings.TOGETHER_MODEL
         self.base_url = "https://api.together.xyz/v1/chat/completions"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Returns the shared HTTP client, creating it on first use so requests reuse its connection pool."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        return self._client
+
+    async def close(self):
+        """Closes the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_chat_response(
         self,
@@ -76,26 +96,29 @@ class TogetherService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                async with client.stream("POST", self.base_url, headers=headers, json=payload) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if not line or not line.startswith("data:"):
-                            continue
-                        data = line[len("data:"):].strip()
-                        if data == "[DONE]":
-                            break
-                        try:
-                            parsed = json.loads(data)
-                        except json.JSONDecodeError:
-                            continue
-                        choices = parsed.get("choices", [])
-                        if not choices:
-                            continue
-                        delta = choices[0].get("delta", {})
-                        content = delta.get("content")
-                        if content:
-                            yield content
+            client = self._get_client()
+            async with client.stream("POST", self.base_url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        parsed = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    choices = parsed.get("choices", [])
+                    if not choices:
+                        continue
+                    delta = choices[0].get("delta", {})
+                    content = delta.get("content")
+                    if content:
+                        yield content
+        except httpx.PoolTimeout:
+            # Every pooled connection is busy; tell the caller rather than returning an empty answer.
+            raise HTTPException(status_code=503, detail="Chat service is busy, please try again shortly.")
         except Exception as e:
             # Keep behavior similar to previous service by logging and yielding nothing else.
             print(f"Together chat stream error: {str(e)}")
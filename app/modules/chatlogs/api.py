@@ -2,8 +2,7 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import date
-from fastapi.responses import StreamingResponse
-import io
+from fastapi.responses import Response
 
 from app.core.dependencies import get_current_user, get_db, get_current_super_admin, get_current_company_admin, get_current_employee
 from app.schemas import chatlog_schema, conversation_schema
@@ -30,6 +29,16 @@ user_router = APIRouter(
 )
 
 
+def _json_attachment(json_data: str) -> Response:
+    # The export is already fully in memory; send it as one body rather than
+    # streaming a BytesIO, which iterates (and copies) it line by line.
+    return Response(
+        content=json_data.encode('utf-8'),
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=chatlogs.json"}
+    )
+
+
 @admin_router.get("/", response_model=List[chatlog_schema.Chatlog])
 async def read_all_chatlogs_as_admin(
     db: AsyncSession = Depends(get_db),
@@ -79,12 +88,7 @@ async def export_chatlogs_as_company_admin(
     json_data = await chatlog_service.export_chatlogs_as_company_admin(
         db, current_user.company_id, start_date=start_date, end_date=end_date
     )
-    json_bytes = json_data.encode('utf-8')
-    return StreamingResponse(
-        io.BytesIO(json_bytes),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=chatlogs.json"}
-    )
+    return _json_attachment(json_data)
 
 @company_admin_router.get("/{conversation_id}", response_model=conversation_schema.ConversationDetailResponse)
 async def get_conversation_details_as_company_admin(
@@ -208,9 +212,4 @@ async def export_chatlogs_as_admin(
     json_data = await chatlog_service.export_chatlogs_as_admin(
         db, start_date=start_date, end_date=end_date
     )
-    json_bytes = json_data.encode('utf-8')
-    return StreamingResponse(
-        io.BytesIO(json_bytes),
-        media_type="application/json",
-        headers={"Content-Disposition": "attachment; filename=chatlogs.json"}
-    )
+    return _json_attachment(json_data)
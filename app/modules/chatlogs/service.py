@@ -152,7 +152,7 @@ async def get_conversations_as_company_admin_service(
     total_pages = math.ceil(total_conversations / limit) if limit > 0 else 0
     
     return conversation_schema.PaginatedCompanyConversationResponse(
-        conversations=[conversation_schema.CompanyConversationResponse.from_orm(conv) for conv in conversations],
+        conversations=conversation_schema.CompanyConversationListAdapter.validate_python(conversations, from_attributes=True),
         total_pages=total_pages,
         current_page=page,
         total_conversations=total_conversations,
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -104,7 +105,7 @@ async def update_company_by_admin_service(
     if admin_name:
         current_user.name = admin_name
     if admin_password:
-        current_user.hashed_password = get_password_hash(admin_password)
+        current_user.hashed_password = await asyncio.to_thread(get_password_hash, admin_password)
     
     db.add(current_user)
 
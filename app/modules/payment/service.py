@@ -12,6 +12,9 @@ from app.core.config import settings
 from app.models.user_model import Users
 from app.schemas.subscription_schema import Subscription
 
+# One keep-alive pool for all iPaymu calls instead of a fresh connection per request.
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
 
 class IPaymuService:
     def __init__(self):
@@ -20,6 +23,19 @@ class IPaymuService:
         # Kembali ke Sandbox untuk pengujian
         self.payment_url = "https://sandbox.ipaymu.com/api/v2/payment"
         self.transaction_detail_url = "https://sandbox.ipaymu.com/api/v2/transaction"
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Mengembalikan HTTP client bersama; dibuat saat pertama dipakai agar koneksi ke iPaymu digunakan ulang."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=HTTP_LIMITS)
+        return self._client
+
+    async def close(self):
+        """Menutup HTTP client bersama."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _normalize_url(self, path: str) -> str:
         """Memastikan base URL dan path digabungkan dengan bersih."""
@@ -77,25 +93,25 @@ class IPaymuService:
         signature = self._get_api_signature("POST", body=payload)
 
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "signature": signature,
-                    "va": self.va,
-                    "Content-Type": "application/json",
-                    "timestamp": timestamp,
-                }
-                response = await client.post(self.payment_url, headers=headers, json=payload)
-                response.raise_for_status()
-                response_data = response.json()
-
-                if response_data.get("Status") == 200:
-                    data = response_data.get("Data")
-                    payment_url = data.get("Url")
-                    trx_id = data.get("TransactionId") or data.get("SessionID")
-                    return payment_url, str(trx_id)
-
-                error_message = response_data.get("Message", "Unknown iPaymu error")
-                raise HTTPException(status_code=500, detail=f"Failed to create payment link: {error_message}")
+            client = self._get_client()
+            headers = {
+                "signature": signature,
+                "va": self.va,
+                "Content-Type": "application/json",
+                "timestamp": timestamp,
+            }
+            response = await client.post(self.payment_url, headers=headers, json=payload)
+            response.raise_for_status()
+            response_data = response.json()
+
+            if response_data.get("Status") == 200:
+                data = response_data.get("Data")
+                payment_url = data.get("Url")
+                trx_id = data.get("TransactionId") or data.get("SessionID")
+                return payment_url, str(trx_id)
+
+            error_message = response_data.get("Message", "Unknown iPaymu error")
+            raise HTTPException(status_code=500, detail=f"Failed to create payment link: {error_message}")
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=500, detail=f"HTTP error with iPaymu API: {e.response.text}")
@@ -129,25 +145,25 @@ class IPaymuService:
         signature = self._get_api_signature("POST", body=payload)
 
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "signature": signature,
-                    "va": self.va,
-                    "Content-Type": "application/json",
-                    "timestamp": timestamp,
-                }
-                response = await client.post(self.payment_url, headers=headers, json=payload)
-                response.raise_for_status()
-                response_data = response.json()
-
-                if response_data.get("Status") == 200:
-                    data = response_data.get("Data")
-                    payment_url = data.get("Url")
-                    trx_id = data.get("TransactionId") or data.get("SessionID")
-                    return payment_url, str(trx_id)
-
-                error_message = response_data.get("Message", "Unknown iPaymu error")
-                raise HTTPException(status_code=500, detail=f"Failed to create payment link: {error_message}")
+            client = self._get_client()
+            headers = {
+                "signature": signature,
+                "va": self.va,
+                "Content-Type": "application/json",
+                "timestamp": timestamp,
+            }
+            response = await client.post(self.payment_url, headers=headers, json=payload)
+            response.raise_for_status()
+            response_data = response.json()
+
+            if response_data.get("Status") == 200:
+                data = response_data.get("Data")
+                payment_url = data.get("Url")
+                trx_id = data.get("TransactionId") or data.get("SessionID")
+                return payment_url, str(trx_id)
+
+            error_message = response_data.get("Message", "Unknown iPaymu error")
+            raise HTTPException(status_code=500, detail=f"Failed to create payment link: {error_message}")
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(status_code=500, detail=f"HTTP error with iPaymu API: {e.response.text}")
@@ -164,19 +180,19 @@ class IPaymuService:
         signature = self._get_api_signature("POST", body=payload)
 
         try:
-            async with httpx.AsyncClient() as client:
-                headers = {
-                    "signature": signature,
-                    "va": self.va,
-                    "Content-Type": "application/json",
-                    "timestamp": timestamp,
-                }
-                response = await client.post(self.transaction_detail_url, headers=headers, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                if data.get("Status") == 200 and data.get("Success"):
-                    return data.get("Data")
-                return None
+            client = self._get_client()
+            headers = {
+                "signature": signature,
+                "va": self.va,
+                "Content-Type": "application/json",
+                "timestamp": timestamp,
+            }
+            response = await client.post(self.transaction_detail_url, headers=headers, json=payload)
+            response.raise_for_status()
+            data = response.json()
+            if data.get("Status") == 200 and data.get("Success"):
+                return data.get("Data")
+            return None
         except Exception:
             # Jangan blokir alur utama hanya karena fetch bukti gagal
             return None
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -45,6 +45,9 @@ class CompanyConversationResponse(BaseModel):
         from_attributes = True
         populate_by_name = True
 
+# Validates a whole page of ORM rows in one pass instead of one from_orm call per row.
+CompanyConversationListAdapter = TypeAdapter(List[CompanyConversationResponse])
+
 class PaginatedCompanyConversationResponse(BaseModel):
     conversations: List[CompanyConversationResponse]
     total_pages: int
@@ -1,21 +1,27 @@
+import asyncio
 import logging
+from functools import lru_cache
+
 import sib_api_v3_sdk
 from sib_api_v3_sdk.rest import ApiException
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 
+@lru_cache(maxsize=1)
+def _transactional_api() -> sib_api_v3_sdk.TransactionalEmailsApi:
+    """Builds the Brevo client once so its connection pool is reused across emails."""
+    # Konfigurasi API Key Brevo
+    configuration = sib_api_v3_sdk.Configuration()
+    configuration.api_key['api-key'] = settings.BREVO_API_KEY
+    return sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
+
+
 async def send_brevo_email(to_email: str, subject: str, html_content: str):
     """
     Sends a transactional email using Brevo API.
     """
-    # Konfigurasi API Key Brevo
-    configuration = sib_api_v3_sdk.Configuration()
-    configuration.api_key['api-key'] = settings.BREVO_API_KEY
-    
-    # Instantiate the TransactionalEmailsApi client
-    api_client = sib_api_v3_sdk.ApiClient(configuration)
-    transactional_api = sib_api_v3_sdk.TransactionalEmailsApi(api_client)
+    transactional_api = _transactional_api()
 
     # Tentukan detail pengirim
     # Mengambil dari environment variable atau menggunakan default
@@ -37,8 +43,9 @@ async def send_brevo_email(to_email: str, subject: str, html_content: str):
     )
 
     try:
-        # Lakukan panggilan untuk mengirim email transaksional
-        response = transactional_api.send_transac_email(send_smtp_email)
+        # Lakukan panggilan untuk mengirim email transaksional.
+        # SDK Brevo bersifat blocking, jadi dijalankan di thread agar event loop tetap bebas.
+        response = await asyncio.to_thread(transactional_api.send_transac_email, send_smtp_email)
         logging.info(f"Email sent successfully to {to_email}. Response: {response}")
         # Objek response mungkin berisi 'messageId' atau yang serupa
     except ApiException as e:
@@ -4,6 +4,9 @@ import pathlib
 import logging
 from fastapi import UploadFile
 
+# Uploads are copied to disk in pieces of this size rather than read into memory whole.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 async def save_uploaded_file(file: UploadFile, upload_dir: str) -> str:
     """
     Saves an uploaded file to the specified directory and returns its relative URL path.
@@ -21,9 +24,9 @@ async def save_uploaded_file(file: UploadFile, upload_dir: str) -> str:
     file_path = os.path.join(upload_dir, filename)
 
     try:
-        file_content = await file.read()
         with open(file_path, "wb") as f:
-            f.write(file_content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
         
         # Return the URL path (e.g., /static/employee_profiles/filename.ext)
         return f"/{file_path}"
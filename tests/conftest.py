@@ -1,20 +1,182 @@
+import bcrypt
+import contextlib
+import sys
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock
-from app.main import app
 from app.models.user_model import Users
+from app.models.company_model import Company
+from app.models.document_model import Documents, DocumentStatus
 from app.core.dependencies import get_current_user, get_current_company_admin, get_current_super_admin, get_db
 from sqlalchemy.ext.asyncio import AsyncSession
 import pytest
 
+try:
+    import uvloop
+except ImportError:  # uvloop does not build on Windows; fall back to the stock asyncio loop.
+    uvloop = None
+
+
+# --- Model fixtures ---
+# Field values are shared; every test gets freshly built rows. A copy.copy of a mapped
+# instance would share its _sa_instance_state, so writes would leak into the original.
+
+_MOCK_ADMIN_USER_FIELDS = dict(
+    id=1,
+    name="Admin User",
+    email="admin@example.com",
+    username="adminuser",
+    role="admin",
+    company_id=1,
+    is_active=True
+)
+
+_MOCK_EMPLOYEE_USER_FIELDS = dict(
+    id=1,
+    name="Test User",
+    username="testuser",
+    role="employee",
+    company_id=1,
+    is_active=True
+)
+
+_MOCK_SUPER_ADMIN_FIELDS = dict(
+    id=999,
+    name="Super Admin",
+    username="superadmin",
+    role="super_admin",
+    company_id=None,
+    is_active=True
+)
+
+_MOCK_COMPANY_FIELDS = dict(id=1, name="Test Company", code="TC", is_active=True)
+
+_MOCK_DOCUMENT_FIELDS = dict(
+    id=1,
+    title="Test Document",
+    company_id=1,
+    status=DocumentStatus.UPLOADED,
+    content_type="application/pdf"
+)
+
+
+@pytest.fixture
+def mock_admin_user():
+    return Users(**_MOCK_ADMIN_USER_FIELDS)
+
+
+@pytest.fixture
+def mock_employee_user():
+    return Users(**_MOCK_EMPLOYEE_USER_FIELDS)
+
 
 @pytest.fixture
-def mock_db_session():
+def mock_super_admin():
+    return Users(**_MOCK_SUPER_ADMIN_FIELDS)
+
+
+@pytest.fixture
+def mock_company():
+    return Company(**_MOCK_COMPANY_FIELDS)
+
+
+@pytest.fixture
+def mock_document():
+    return Documents(**_MOCK_DOCUMENT_FIELDS)
+
+
+@pytest.fixture(scope="session")
+def doc_factory():
+    """Build a Documents row from the default mock document plus field overrides."""
+    def make(**overrides):
+        return Documents(**{**_MOCK_DOCUMENT_FIELDS, **overrides})
+    return make
+
+
+@pytest.fixture(scope="session")
+def hashed_test_password():
+    """bcrypt hash of "password123", made once at the cheapest cost factor instead of the app's 12 rounds."""
+    return bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+@pytest.fixture
+def patch_stack():
+    """ExitStack that tests enter patches on; everything is undone at teardown."""
+    with contextlib.ExitStack() as stack:
+        yield stack
+
+
+@pytest.fixture(scope="module")
+def _mock_db_session_template():
+    # Walking the AsyncSession spec is the expensive part, so do it once per module.
     return AsyncMock(spec=AsyncSession)
 
 
+@pytest.fixture
+def mock_db_session(_mock_db_session_template):
+    _mock_db_session_template.reset_mock(return_value=True, side_effect=True)
+    return _mock_db_session_template
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _orjson_responses():
+    # TestClient and httpx.AsyncClient both return httpx.Response; decode bodies with orjson.
+    def _json(self, **kwargs):
+        return orjson.loads(self.content) if not kwargs else _stdlib_json(self, **kwargs)
+
+    _stdlib_json = httpx.Response.json
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(httpx.Response, "json", _json)
+        yield
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI app, imported on first use so pure unit tests never build it."""
+    from app.main import app
+    return app
+
+
+# Modules that test plain models, schemas and helpers; none of them should need the app.
+_PURE_UNIT_MODULES = {
+    "test_models",
+    "test_repositories",
+    "test_schemas",
+    "test_file_manager",
+    "test_email_sender",
+    "test_global_error_handler",
+}
+
+
+def pytest_collection_modifyitems(session, config, items):
+    # Importing app.main builds the whole service graph (Pinecone, LLM clients), so a
+    # module-level import of it sneaking back into the suite would slow every run.
+    if "app.main" not in sys.modules:
+        return
+    pure = sorted({item.module.__name__ for item in items
+                   if item.module is not None and item.module.__name__ in _PURE_UNIT_MODULES})
+    if pure:
+        raise pytest.UsageError(
+            f"app.main was imported during collection alongside pure unit tests {pure}; "
+            "use the lazy `app` fixture instead of importing app.main at module level."
+        )
+
+
+if uvloop is not None:
+    def pytest_asyncio_loop_factories(config, item):
+        # Run every async test and fixture on uvloop; it schedules callbacks faster than asyncio's default loop.
+        return {"uvloop": uvloop.new_event_loop}
+
+
 @pytest.fixture(autouse=True)
-def override_get_db(mock_db_session):
+def override_get_db(request, mock_db_session):
+    # Only wire the override when this test (or its module) actually uses the app.
+    if "app" not in request.fixturenames and "app.main" not in sys.modules:
+        yield
+        return
+    app = request.getfixturevalue("app")
     async def _override():
         yield mock_db_session
     app.dependency_overrides[get_db] = _override
@@ -22,57 +184,68 @@ def override_get_db(mock_db_session):
     app.dependency_overrides.pop(get_db, None)
 
 
-@pytest.fixture(scope="module")
-def authenticated_client():
-    """Provide an authenticated client for testing (as regular user)."""
-    mock_user = Users(
-        id=1,
-        name="Test User",
-        username="testuser",
-        role="employee",
-        company_id=1,
-        is_active=True
-    )
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    with TestClient(app) as client:
+_AUTH_HEADER = {"Authorization": "Bearer mock_token"}
+
+
+@pytest.fixture(scope="session")
+def _test_client(app):
+    # One TestClient per session so startup/shutdown events run once, not per module.
+    # The bearer token is a placeholder: auth is resolved through dependency overrides.
+    with TestClient(app, headers=_AUTH_HEADER) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def error_client(app):
+    """Client that returns the app's 500 response instead of re-raising server errors."""
+    with TestClient(app, headers=_AUTH_HEADER, raise_server_exceptions=False) as client:
         yield client
-    app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def app_instance():
+def client(_test_client):
+    """Provide the shared client with no auth override installed."""
+    return _test_client
+
+
+@contextlib.contextmanager
+def _as_user(app, dependency, user):
+    app.dependency_overrides[dependency] = lambda: user
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(dependency, None)
+
+
+@pytest.fixture
+def authenticated_client(app, _test_client, mock_employee_user):
+    """Provide an authenticated client for testing (as regular user)."""
+    with _as_user(app, get_current_user, mock_employee_user):
+        yield _test_client
+
+
+@pytest.fixture
+def app_instance(app):
     return app
 
 
-@pytest.fixture(scope="module")
-def admin_client():
+@pytest.fixture
+def admin_client(app, _test_client, mock_admin_user):
     """Provide an authenticated client as company admin."""
-    mock_admin = Users(
-        id=2,
-        name="Admin User",
-        username="adminuser",
-        role="admin",
-        company_id=1,
-        is_active=True
-    )
-    app.dependency_overrides[get_current_company_admin] = lambda: mock_admin
-    with TestClient(app) as client:
-        yield client
-    app.dependency_overrides.clear()
+    with _as_user(app, get_current_company_admin, mock_admin_user):
+        yield _test_client
 
 
-@pytest.fixture(scope="module")
-def super_admin_client():
+@pytest.fixture
+async def async_admin_client(app, mock_admin_user):
+    """Company-admin client that calls the ASGI app on the test's event loop (no TestClient thread hop)."""
+    with _as_user(app, get_current_company_admin, mock_admin_user):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+
+@pytest.fixture
+def super_admin_client(app, _test_client, mock_super_admin):
     """Provide an authenticated client as super admin."""
-    mock_super_admin = Users(
-        id=3,
-        name="Super Admin",
-        username="superadmin",
-        role="super_admin",
-        company_id=None,
-        is_active=True
-    )
-    app.dependency_overrides[get_current_super_admin] = lambda: mock_super_admin
-    with TestClient(app) as client:
-        yield client
-    app.dependency_overrides.clear()
+    with _as_user(app, get_current_super_admin, mock_super_admin):
+        yield _test_client
@@ -0,0 +1,37 @@
+"""Module-scoped service patches shared by the endpoint test modules."""
+import contextlib
+from unittest.mock import DEFAULT, patch
+
+import pytest
+
+
+def service_mock_fixtures(*targets):
+    """Build the module-scoped service patches and the autouse fixture that resets them per test.
+
+    Each target is a ``(module, names)`` pair; every name is replaced with a mock for the whole
+    module and tests only reconfigure the mocks through the ``service_mocks`` fixture. Bind both
+    returned fixtures at module level::
+
+        _service_patches, service_mocks = service_mock_fixtures((company_service, ["get_company_by_user_service"]))
+    """
+    for module, names in targets:
+        missing = [name for name in names if not hasattr(module, name)]
+        if missing:
+            # Fail at import with the real cause instead of erroring every test at setup.
+            raise AttributeError(f"{module.__name__} has no attribute(s) {missing} to patch")
+
+    @pytest.fixture(scope="module", name="_service_patches")
+    def _service_patches():
+        with contextlib.ExitStack() as stack:
+            mocks = {}
+            for module, names in targets:
+                mocks.update(stack.enter_context(patch.multiple(module, **dict.fromkeys(names, DEFAULT))))
+            yield mocks
+
+    @pytest.fixture(autouse=True, name="service_mocks")
+    def service_mocks(_service_patches):
+        for mock in _service_patches.values():
+            mock.reset_mock(return_value=True, side_effect=True)
+        return _service_patches
+
+    return _service_patches, service_mocks
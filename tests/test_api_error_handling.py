@@ -1,14 +1,7 @@
 import pytest
-from fastapi.testclient import TestClient
 from fastapi import FastAPI, HTTPException, status
 from unittest.mock import patch
 
-# Import the main FastAPI app instance
-from app.main import app # Assuming app is created in app/main.py
-
-# --- Test Client Setup ---
-client = TestClient(app)
-
 # --- Helper function to create a mock endpoint for testing ---
 def create_test_endpoint(app: FastAPI, path: str, status_code: int, detail: str, exception_type: type = HTTPException):
     @app.get(path)
@@ -26,8 +19,7 @@ def create_test_endpoint(app: FastAPI, path: str, status_code: int, detail: str,
 
 # --- Integration Tests for Global Error Handlers ---
 
-@pytest.mark.asyncio
-async def test_global_http_exception_handling():
+def test_global_http_exception_handling(app, client):
     """
     Tests if the global http_exception_handler correctly processes HTTPException.
     """
@@ -45,8 +37,7 @@ async def test_global_http_exception_handling():
     # In a real scenario, you might want to use a fixture to manage app state.
     # For simplicity here, we assume the app state is clean between tests or managed by pytest.
 
-@pytest.mark.asyncio
-async def test_global_validation_exception_handling():
+def test_global_validation_exception_handling(app, client):
     """
     Tests if the global validation_exception_handler correctly processes RequestValidationError.
     This requires simulating a request that would cause a validation error.
@@ -73,8 +64,7 @@ async def test_global_validation_exception_handling():
     # Check for specific error message content if possible, e.g., "value is not a valid integer"
     assert any("value is not a valid integer" in err for err in response_data["details"]["errors"])
 
-@pytest.mark.asyncio
-async def test_global_general_exception_handling():
+def test_global_general_exception_handling(app, error_client):
     """
     Tests if the global general_exception_handler catches unexpected exceptions.
     """
@@ -85,7 +75,8 @@ async def test_global_general_exception_handling():
 
     # Patch the logger to check if it's called
     with patch("app.core.global_error_handler.logger") as mock_logger:
-        response = client.get("/test-general-exception")
+        # Starlette re-raises after the Exception handler responds, so use the non-raising client.
+        response = error_client.get("/test-general-exception")
         
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
         assert response.json() == {"message": "An unexpected internal server error occurred.", "code": 500}
@@ -96,7 +87,6 @@ async def test_global_general_exception_handling():
 # --- Test for specific custom exceptions (if any were defined and handled) ---
 # If we had custom exceptions like UserAlreadyExistsError, we would test them here.
 # For example:
-# @pytest.mark.asyncio
 # async def test_custom_user_already_exists_exception():
 #     # Assume a route that raises UserAlreadyExistsError
 #     # And assume a handler for it in global_error_handler.py
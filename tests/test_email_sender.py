@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sib_api_v3_sdk.rest import ApiException
+from unittest.mock import patch
+
+from app.utils import email_sender
+from app.utils.email_sender import send_brevo_email
+
+
+@pytest.fixture
+def transactional_api():
+    with patch.object(email_sender, "_transactional_api") as api_factory:
+        yield api_factory.return_value
+
+
+async def test_send_brevo_email_runs_sdk_call_off_the_event_loop(transactional_api):
+    caller_threads = []
+    transactional_api.send_transac_email.side_effect = lambda email: caller_threads.append(threading.get_ident())
+
+    await send_brevo_email("user@example.com", "Subject", "<p>Hi</p>")
+
+    # The Brevo SDK blocks, so the send must happen on a worker thread, not the loop's thread.
+    assert caller_threads and caller_threads[0] != threading.get_ident()
+    (sent,), _ = transactional_api.send_transac_email.call_args
+    assert sent.to == [{"email": "user@example.com", "name": "user@example.com"}]
+    assert sent.subject == "Subject"
+
+
+@pytest.mark.parametrize(
+    "error, detail",
+    [
+        (ApiException(status=400, reason="Bad Request"), "Gagal mengirim email: Bad Request"),
+        (ConnectionError("boom"), "Terjadi kesalahan tak terduga saat mengirim email."),
+    ],
+    ids=["api_exception", "unexpected"],
+)
+async def test_send_brevo_email_maps_failures_to_http_500(transactional_api, error, detail):
+    transactional_api.send_transac_email.side_effect = error
+
+    with pytest.raises(HTTPException) as exc_info:
+        await send_brevo_email("user@example.com", "Subject", "<p>Hi</p>")
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == detail
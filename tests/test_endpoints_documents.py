@@ -1,93 +1,136 @@
-from fastapi.testclient import TestClient
-from unittest.mock import patch
+import io
+import pytest
+import httpx
+from unittest.mock import ANY
 from fastapi import HTTPException
-from app.main import app
+from app.core.dependencies import get_current_company_admin
 from app.models.document_model import Documents, DocumentStatus
+from app.modules.documents import api as document_api
+from app.modules.documents import service as document_service
+from service_mocks import service_mock_fixtures
 
+# Static request payloads, built once at import.
+_UPLOAD_FORM = {"name": "test_file.txt", "tags": "tag1,tag2"}
+_ADMIN_TAGS = ["admin", "confidential"]
 
-# --- Test Functions using admin_client fixture ---
 
-def test_get_documents_endpoint(admin_client: TestClient):
-    mock_document = Documents(
-        id=1,
-        title="Test Document",
-        company_id=1,
-        status=DocumentStatus.UPLOADED,
-        content_type="application/pdf"
-    )
-    with patch('app.modules.documents.service.get_all_company_documents_service', return_value=([mock_document], 1)):
-        response = admin_client.get("/api/documents/")
-        assert response.status_code == 200
-        # The endpoint now returns a paginated response
-        assert len(response.json()["documents"]) == 1
-        assert response.json()["documents"][0]["id"] == 1
-
-
-def test_get_single_document_endpoint(admin_client: TestClient):
-    mock_document = Documents(
-        id=1,
-        title="Test Document",
-        company_id=1,
-        status=DocumentStatus.UPLOADED,
-        content_type="application/pdf"
+# --- Service Mocks ---
+
+_service_patches, service_mocks = service_mock_fixtures(
+    (document_service, [
+        "get_all_company_documents_service",
+        "read_single_document_service",
+        "upload_document_service",
+        "delete_document_service",
+        "update_document_content_service",
+    ]),
+    (document_api, ["log_activity"]),
+)
+
+
+# --- Module-scoped documents (the endpoints only serialize them, never mutate) ---
+
+@pytest.fixture(scope="module")
+def uploading_document(doc_factory):
+    return doc_factory(title="test_file.txt", status=DocumentStatus.UPLOADING, content_type="application/octet-stream")
+
+@pytest.fixture(scope="module")
+def tagged_document(doc_factory):
+    return doc_factory(title="Admin Document", status=DocumentStatus.COMPLETED, tags=_ADMIN_TAGS)
+
+
+# --- Test Functions using async_admin_client fixture ---
+
+async def test_get_documents_endpoint(async_admin_client: httpx.AsyncClient, service_mocks, mock_document: Documents):
+    service_mocks['get_all_company_documents_service'].return_value = ([mock_document], 1)
+    response = await async_admin_client.get("/api/documents/")
+    assert response.status_code == 200
+    # The endpoint now returns a paginated response
+    data = response.json()
+    assert len(data["documents"]) == 1
+    assert data["documents"][0]["id"] == 1
+
+
+# Sizes straddle the multipart parser's chunking so a regression in streaming uploads shows up here.
+@pytest.mark.parametrize("size", [1 << 10, 1 << 20], ids=["1KiB", "1MiB"])
+async def test_upload_document_endpoint(async_admin_client: httpx.AsyncClient, service_mocks, uploading_document, size):
+    upload_service = service_mocks['upload_document_service']
+    upload_service.return_value = uploading_document
+    payload = io.BufferedReader(io.BytesIO(b"x" * size), buffer_size=1 << 20)
+    response = await async_admin_client.post(
+        "/api/documents/upload",
+        files={"file": ("test_file.txt", payload, "application/octet-stream")},
+        data=_UPLOAD_FORM,
     )
-    with patch('app.modules.documents.service.read_single_document_service', return_value=mock_document):
-        response = admin_client.get("/api/documents/1")
-        assert response.status_code == 200
-        assert response.json()["id"] == 1
-
-
-def test_upload_document_endpoint(admin_client: TestClient):
-    mock_document = Documents(
-        id=1,
-        title="test_file.txt",
-        company_id=1,
-        status=DocumentStatus.UPLOADING,
-        content_type="text/plain"
+    assert response.status_code == 202
+    assert response.json()["id"] == 1
+    assert upload_service.call_args.kwargs["file"].size == size
+
+
+async def test_delete_document_endpoint(async_admin_client: httpx.AsyncClient, service_mocks):
+    service_mocks['delete_document_service'].return_value = None
+    response = await async_admin_client.delete("/api/documents/1")
+    assert response.status_code == 204
+
+
+def _forbidden():
+    # Mimics a non-admin user hitting an admin-only dependency.
+    raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@pytest.fixture
+def admin_override(request, app, async_admin_client):
+    """Swap the company-admin dependency for request.param (None keeps the admin user) for one test."""
+    if request.param is None:
+        yield
+        return
+    previous = app.dependency_overrides[get_current_company_admin]
+    app.dependency_overrides[get_current_company_admin] = request.param
+    try:
+        yield
+    finally:
+        # Restore the admin override so the rest of the module is unaffected.
+        app.dependency_overrides[get_current_company_admin] = previous
+
+
+@pytest.mark.parametrize(
+    "admin_override, found, expected_status",
+    [(None, True, 200), (_forbidden, True, 403), (None, False, 404)],
+    indirect=["admin_override"],
+    ids=["admin", "non_admin", "not_found"],
+)
+async def test_get_single_document(async_admin_client: httpx.AsyncClient, admin_override, service_mocks, tagged_document, found, expected_status):
+    read_service = service_mocks['read_single_document_service']
+    if found:
+        read_service.return_value = tagged_document
+    else:
+        read_service.side_effect = HTTPException(status_code=404, detail="Document not found")
+    response = await async_admin_client.get("/api/documents/1")
+    assert response.status_code == expected_status
+    if expected_status == 200:
+        data = response.json()
+        assert data["id"] == 1
+        assert data["tags"] == _ADMIN_TAGS
+
+
+# tags=None leaves the stored tags alone, [] clears them; either way the response carries a list.
+@pytest.mark.parametrize("new_tags", [["finance", "report", "2025"], None, []], ids=["with_tags", "no_tags", "clear_tags"])
+async def test_update_document_content(async_admin_client: httpx.AsyncClient, service_mocks, doc_factory, new_tags):
+    payload = {"new_content": "Updated content", "title": "Updated Title"}
+    if new_tags is not None:
+        payload["tags"] = new_tags
+    update_service = service_mocks['update_document_content_service']
+    update_service.return_value = doc_factory(
+        title="Updated Title", status=DocumentStatus.EMBEDDING, extracted_text="Updated content", tags=new_tags
     )
-    with patch('app.modules.documents.service.upload_document_service', return_value=mock_document):
-        test_file_content = b"This is a test file."
-        response = admin_client.post(
-            "/api/documents/upload",
-            files={"file": ("test_file.txt", test_file_content, "text/plain")},
-            data={"name": "test_file.txt", "tags": "tag1,tag2"}
-        )
-        assert response.status_code == 202
-        assert response.json()["id"] == 1
-
-
-def test_delete_document_endpoint(admin_client: TestClient):
-    with patch('app.modules.documents.service.delete_document_service', return_value=None):
-        response = admin_client.delete("/api/documents/1")
-        assert response.status_code == 204
-
-
-def test_admin_can_get_single_document(admin_client: TestClient):
-    mock_document = Documents(
-        id=1,
-        title="Admin Document",
-        company_id=1,
-        status=DocumentStatus.COMPLETED,
-        content_type="application/pdf",
-        tags=["admin", "confidential"]
+    response = await async_admin_client.put("/api/documents/1/content", json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    expected = {
+        "id": 1, "title": "Updated Title", "extracted_text": "Updated content",
+        "status": "EMBEDDING", "tags": new_tags or [],
+    }
+    assert {key: data[key] for key in expected} == expected
+    update_service.assert_awaited_once_with(
+        db=ANY, current_user=ANY, document_id=1, new_content="Updated content", title="Updated Title", tags=new_tags
     )
-    with patch('app.modules.documents.service.read_single_document_service', return_value=mock_document):
-        response = admin_client.get("/api/documents/1")
-        assert response.status_code == 200
-        assert response.json()["tags"] == ["admin", "confidential"]
-
-
-def test_non_admin_cannot_get_single_document():
-    # Use a fresh TestClient without admin permissions
-    with TestClient(app) as client:
-        # Override dependency to mimic non-admin user lacking permissions
-        app.dependency_overrides[get_current_company_admin] = AsyncMock(side_effect=HTTPException(status_code=403, detail="Forbidden"))
-        response = client.get("/api/documents/1")
-        assert response.status_code == 403
-        app.dependency_overrides.clear()
-
-
-def test_get_single_document_not_found(admin_client: TestClient):
-    with patch('app.modules.documents.service.read_single_document_service', side_effect=HTTPException(status_code=404, detail="Document not found")):
-        response = admin_client.get("/api/documents/999")
-        assert response.status_code == 404
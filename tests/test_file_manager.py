@@ -1,39 +1,42 @@
 import io
 import os
-import tempfile
 
 import pytest
 from fastapi import UploadFile
 
-from app.utils.file_manager import save_uploaded_file, delete_static_file
+from app.utils.file_manager import UPLOAD_CHUNK_SIZE, save_uploaded_file, delete_static_file
 
 
-@pytest.mark.asyncio
-async def test_save_uploaded_file_creates_file_and_returns_path():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        upload = UploadFile(filename="sample.txt", file=io.BytesIO(b"hello"))
+@pytest.mark.parametrize(
+    "content",
+    [b"hello", b"x" * (UPLOAD_CHUNK_SIZE * 2 + 1)],
+    ids=["small", "multi_chunk"],
+)
+async def test_save_uploaded_file_creates_file_and_returns_path(content, tmp_path, monkeypatch):
+    # save_uploaded_file returns a URL relative to the working directory, as under static/ in
+    # production; monkeypatch restores the cwd and tmp_path keeps the repo tree clean.
+    monkeypatch.chdir(tmp_path)
+    upload_dir = os.path.join("static", "uploads")
+    upload = UploadFile(filename="sample.txt", file=io.BytesIO(content))
 
-        saved_path = await save_uploaded_file(upload, tmpdir)
+    saved_path = await save_uploaded_file(upload, upload_dir)
 
-        # Path returned should start with '/' because save_uploaded_file prefixes it
-        assert saved_path.startswith("/")
-        local_path = saved_path.lstrip("/")
-        assert os.path.exists(local_path)
+    # Path returned should start with '/' because save_uploaded_file prefixes it
+    assert saved_path.startswith("/")
+    local_path = saved_path.lstrip("/")
+    assert os.path.dirname(local_path) == upload_dir
+    with open(local_path, "rb") as f:
+        assert f.read() == content
 
 
-def test_delete_static_file_removes_existing_file():
-    # Use a temporary working directory to align with delete_static_file's expectation of relative paths.
-    with tempfile.TemporaryDirectory() as tmpdir:
-        cwd = os.getcwd()
-        try:
-            os.chdir(tmpdir)
-            os.makedirs("static", exist_ok=True)
-            local_file = os.path.join("static", "to_delete.txt")
-            with open(local_file, "w") as f:
-                f.write("content")
+def test_delete_static_file_removes_existing_file(tmp_path, monkeypatch):
+    # delete_static_file resolves URLs relative to the working directory; monkeypatch restores it.
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "static").mkdir()
+    local_file = os.path.join("static", "to_delete.txt")
+    with open(local_file, "w") as f:
+        f.write("content")
 
-            delete_static_file("/" + local_file)
+    delete_static_file("/" + local_file)
 
-            assert not os.path.exists(local_file)
-        finally:
-            os.chdir(cwd)
+    assert not os.path.exists(local_file)
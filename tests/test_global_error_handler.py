@@ -1,9 +1,9 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
-from starlette.requests import Request
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi import FastAPI, status
+from fastapi import status
 
 from app.core.global_error_handler import (
     http_exception_handler,
@@ -33,12 +33,14 @@ def mock_json_response():
     with patch("app.core.global_error_handler.JSONResponse") as mock:
         yield mock
 
-# Mocking FastAPI app for registration tests
+# The handlers only read request.method and request.url.path
+def fake_request(method, path):
+    return SimpleNamespace(method=method, url=SimpleNamespace(path=path))
+
+# Stand-in FastAPI app for registration tests; only the exception_handler decorator is used
 @pytest.fixture
 def mock_fastapi_app():
-    mock_app = MagicMock(spec=FastAPI)
-    mock_app.exception_handler = MagicMock() # Mock the exception_handler decorator
-    return mock_app
+    return SimpleNamespace(exception_handler=MagicMock())
 
 # --- Test Cases ---
 
@@ -51,11 +53,8 @@ def test_create_error_response():
     assert response_with_details == {"message": "Validation Error", "code": 422, "details": {"field": "email"}}
 
 # Test for http_exception_handler
-@pytest.mark.asyncio
 async def test_http_exception_handler(mock_logger, mock_json_response):
-    mock_request = MagicMock(spec=Request)
-    mock_request.method = "GET"
-    mock_request.url.path = "/test"
+    mock_request = fake_request("GET", "/test")
     
     exc = StarletteHTTPException(status_code=404, detail="Resource not found")
     
@@ -67,43 +66,38 @@ async def test_http_exception_handler(mock_logger, mock_json_response):
         content={"message": "Resource not found", "code": 404}
     )
 
+# Sample validation error structure and the payload the handler should build from it
+VALIDATION_ERRORS = [
+    {"loc": ["body", "email"], "msg": "field required", "type": "value_error.missing"},
+    {"loc": ["body", "age"], "msg": "ensure this value is greater than or equal to 18", "type": "value_error.number.min_value", "ctx": {"limit_value": 18}}
+]
+EXPECTED_VALIDATION_CONTENT = {
+    "message": "Validation failed",
+    "code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "details": {
+        "errors": [
+            "Field 'body.email': field required",
+            "Field 'body.age': ensure this value is greater than or equal to 18"
+        ]
+    }
+}
+
 # Test for validation_exception_handler
-@pytest.mark.asyncio
 async def test_validation_exception_handler(mock_logger, mock_json_response):
-    mock_request = MagicMock(spec=Request)
-    mock_request.method = "POST"
-    mock_request.url.path = "/items"
-    
-    # Sample validation error structure
-    validation_errors = [
-        {"loc": ["body", "email"], "msg": "field required", "type": "value_error.missing"},
-        {"loc": ["body", "age"], "msg": "ensure this value is greater than or equal to 18", "type": "value_error.number.min_value", "ctx": {"limit_value": 18}}
-    ]
-    exc = RequestValidationError(errors=validation_errors)
+    mock_request = fake_request("POST", "/items")
+    exc = RequestValidationError(errors=VALIDATION_ERRORS)
     
     await validation_exception_handler(mock_request, exc)
     
     mock_logger.warning.assert_called_once() # Check if warning was logged
     mock_json_response.assert_called_once_with(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "message": "Validation failed",
-            "code": status.HTTP_422_UNPROCESSABLE_ENTITY,
-            "details": {
-                "errors": [
-                    "Field 'body.email': field required",
-                    "Field 'body.age': ensure this value is greater than or equal to 18"
-                ]
-            }
-        }
+        content=EXPECTED_VALIDATION_CONTENT
     )
 
 # Test for general_exception_handler
-@pytest.mark.asyncio
 async def test_general_exception_handler(mock_logger, mock_traceback, mock_json_response):
-    mock_request = MagicMock(spec=Request)
-    mock_request.method = "GET"
-    mock_request.url.path = "/internal"
+    mock_request = fake_request("GET", "/internal")
     
     exc = ValueError("Something went wrong internally")
     
@@ -1,16 +1,33 @@
-from fastapi.testclient import TestClient
-from app.main import app
+from unittest.mock import AsyncMock
 
 
-def test_root():
-    with TestClient(app) as client:
-        response = client.get("/api/")
-        assert response.status_code == 200
-        assert response.json() == {"message": "Multi-Tenant Company Chatbot API is running"}
+def test_root(client):
+    # Smoke test for routing wiring through the full ASGI stack.
+    response = client.get("/api/")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Multi-Tenant Company Chatbot API is running"}
 
 
-def test_health_check():
-    with TestClient(app) as client:
-        response = client.get("/api/health")
-        assert response.status_code == 200
-        assert response.json() == {"status": "healthy"}
+async def test_health_check(mock_db_session):
+    # Behavioural check straight against the view; routing is covered by test_root.
+    from app.main import health_check
+
+    assert await health_check(db=mock_db_session) == {"status": "healthy"}
+
+
+async def test_shutdown_closes_http_clients_when_db_close_fails(monkeypatch):
+    from app import main
+
+    closes = {
+        "db": AsyncMock(side_effect=RuntimeError("engine gone")),
+        "together": AsyncMock(),
+        "ipaymu": AsyncMock(),
+    }
+    monkeypatch.setattr(main.db_manager, "close", closes["db"])
+    monkeypatch.setattr(main.together_service, "close", closes["together"])
+    monkeypatch.setattr(main.ipaymu_service, "close", closes["ipaymu"])
+
+    await main.shutdown_event()
+
+    for close in closes.values():
+        close.assert_awaited_once()
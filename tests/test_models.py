@@ -1,22 +1,49 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.models.user_model import Users
 from app.models.company_model import Company
 from app.models.document_model import Documents, DocumentStatus
 from app.models.chatlog_model import Chatlogs
 from app.models.base import Base
 
-# Create an in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+# Create an in-memory SQLite database for testing on the same async driver stack as production;
+# StaticPool keeps every session on one connection.
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
 
-test_engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+test_engine = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=StaticPool)
+TestingSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+_DB_TABLES = [Company.__table__, Users.__table__]
 
 
-def test_user_model():
-    # Create tables
-    Base.metadata.create_all(bind=test_engine)
-    
+@pytest.fixture(scope="module")
+async def tables():
+    # Create tables once for the module; always dispose so aiosqlite's worker thread exits.
+    # Only the tables the DB-backed tests touch: Documents.tags is a Postgres ARRAY,
+    # which SQLite cannot compile.
+    try:
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=_DB_TABLES)
+        yield
+        async with test_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all, tables=_DB_TABLES)
+    finally:
+        await test_engine.dispose()
+
+
+@pytest.fixture
+async def db_session(tables):
+    # Each test runs inside an outer transaction that is rolled back at teardown;
+    # commits inside the test only release a SAVEPOINT.
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
+        session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+        yield session
+        await session.close()
+        await transaction.rollback()
+
+
+async def test_user_model(db_session):
     # Create a test user instance
     user = Users(
         name="Test User",
@@ -27,7 +54,10 @@ def test_user_model():
         division="Test Division",
         is_active=True
     )
-    
+    db_session.add(user)
+    await db_session.flush()
+
+    assert user.id is not None
     assert user.name == "Test User"
     assert user.username == "testuser"
     assert user.role == "employee"
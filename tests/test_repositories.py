@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.repository.user_repository import user_repository
 from app.repository.company_repository import company_repository
 from app.repository.document_repository import document_repository
@@ -13,37 +14,38 @@ from app.schemas.document_schema import DocumentCreate
 from app.schemas.chatlog_schema import ChatlogCreate
 
 
-class MockDBSession:
-    def __init__(self):
-        self.add = MagicMock()
-        self.commit = AsyncMock()
-        self.refresh = AsyncMock()
-        
-        # Mock data storage
-        self.users = []
-        self.companies = []
-        self.documents = []
+@pytest.fixture(scope="module")
+def _session():
+    # AsyncSession stand-in: execute/commit/refresh are AsyncMocks, add is a plain MagicMock.
+    return MagicMock(spec=AsyncSession)
 
 
-@pytest.mark.asyncio
-async def test_get_user():
-    db = MockDBSession()
-    user = Users(id=1, name="Test User")
-    db.users.append(user)
-    
-    with patch('sqlalchemy.ext.asyncio.AsyncSession.execute', new_callable=AsyncMock) as mock_execute:
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = user
-        mock_execute.return_value = mock_result
-        
-        result = await user_repository.get_user(db, user_id=1)
-        assert result.id == 1
-        assert result.name == "Test User"
-
-
-@pytest.mark.asyncio
-async def test_create_user():
-    db = MockDBSession()
+@pytest.fixture
+def db(_session):
+    """One session mock per module, reset (including configured results) before each test."""
+    _session.reset_mock(return_value=True, side_effect=True)
+    return _session
+
+
+# (repository getter, row returned by the query, lookup kwargs)
+GET_CASES = [
+    (user_repository.get_user, Users(id=1, name="Test User"), {"user_id": 1}),
+    (company_repository.get_company, Company(id=1, name="Test Company", is_active=True), {"company_id": 1}),
+    (document_repository.get_document, Documents(id=1, title="Test Document", company_id=1), {"document_id": 1}),
+]
+
+
+@pytest.mark.parametrize("getter, row, lookup", GET_CASES, ids=["user", "company", "document"])
+async def test_get_by_id(getter, row, lookup, db):
+    db.execute.return_value = MagicMock(**{"scalar_one_or_none.return_value": row})
+
+    result = await getter(db, **lookup)
+    assert result is row
+    assert result.id == 1
+    db.execute.assert_awaited_once()
+
+
+async def test_create_user(db):
     new_user = Users(
         id=1,
         name="New User",
@@ -52,31 +54,16 @@ async def test_create_user():
         company_id=1
     )
     
-    with patch('app.repository.user_repository.Users', return_value=new_user):
-        result = await user_repository.create_user(db, new_user)
-        assert result.name == "New User"
-        assert result.role == "employee"
+    result = await user_repository.create_user(db, new_user)
+    assert result.name == "New User"
+    assert result.role == "employee"
+    # The injected session sees the whole write path; nothing global is patched.
+    db.add.assert_called_once_with(new_user)
+    db.commit.assert_awaited_once()
+    db.refresh.assert_awaited_once_with(new_user)
 
 
-@pytest.mark.asyncio
-async def test_get_company():
-    db = MockDBSession()
-    company = Company(id=1, name="Test Company", is_active=True)
-    db.companies.append(company)
-    
-    with patch('sqlalchemy.ext.asyncio.AsyncSession.execute', new_callable=AsyncMock) as mock_execute:
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = company
-        mock_execute.return_value = mock_result
-        
-        result = await company_repository.get_company(db, company_id=1)
-        assert result.id == 1
-        assert result.name == "Test Company"
-
-
-@pytest.mark.asyncio
-async def test_create_company():
-    db = MockDBSession()
+async def test_create_company(db):
     company_create = CompanyCreate(name="New Company")
     
     new_company = Company(
@@ -84,30 +71,11 @@ async def test_create_company():
         **company_create.dict()
     )
     
-    with patch('app.repository.company_repository.Company', return_value=new_company):
-        result = await company_repository.create_company(db, new_company)
-        assert result.name == "New Company"
+    result = await company_repository.create_company(db, new_company)
+    assert result.name == "New Company"
 
 
-@pytest.mark.asyncio
-async def test_get_document():
-    db = MockDBSession()
-    document = Documents(id=1, title="Test Document", company_id=1)
-    db.documents.append(document)
-    
-    with patch('sqlalchemy.ext.asyncio.AsyncSession.execute', new_callable=AsyncMock) as mock_execute:
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = document
-        mock_execute.return_value = mock_result
-        
-        result = await document_repository.get_document(db, document_id=1)
-        assert result.id == 1
-        assert result.title == "Test Document"
-
-
-@pytest.mark.asyncio
-async def test_create_document():
-    db = MockDBSession()
+async def test_create_document(db):
     document_create = DocumentCreate(
         title="New Document",
         company_id=1,
@@ -119,15 +87,12 @@ async def test_create_document():
         **document_create.dict()
     )
     
-    with patch('app.repository.document_repository.Documents', return_value=new_document):
-        result = await document_repository.create_document(db, new_document)
-        assert result.title == "New Document"
-        assert result.company_id == 1
+    result = await document_repository.create_document(db, new_document)
+    assert result.title == "New Document"
+    assert result.company_id == 1
 
 
-@pytest.mark.asyncio
-async def test_create_chatlog():
-    db = MockDBSession()
+async def test_create_chatlog(db):
     chatlog_create = ChatlogCreate(
         question="Test question?",
         answer="Test answer.",
@@ -141,8 +106,7 @@ async def test_create_chatlog():
         **chatlog_create.dict()
     )
     
-    with patch('app.repository.chatlog_repository.Chatlogs', return_value=new_chatlog):
-        result = await chatlog_repository.create_chatlog(db, new_chatlog)
-        assert result.question == "Test question?"
-        assert result.answer == "Test answer."
-        assert result.conversation_id == "test_conversation"
+    result = await chatlog_repository.create_chatlog(db, new_chatlog)
+    assert result.question == "Test question?"
+    assert result.answer == "Test answer."
+    assert result.conversation_id == "test_conversation"
@@ -1,161 +1,99 @@
 import uuid
-from datetime import datetime
+
+import orjson
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from app.schemas.user_schema import UserRegistration, UserLoginCombined, User
 from app.schemas.company_schema import Company
-from app.schemas.document_schema import DocumentCreate, Document
+from app.schemas.document_schema import DocumentCreate, Document, ReferencedDocument
 from app.schemas.chatlog_schema import ChatlogCreate, Chatlog
+from app.schemas.conversation_schema import CompanyConversationListAdapter
 from app.schemas.token_schema import Token
 from app.schemas.chat_schema import ChatRequest
 from app.models.document_model import DocumentStatus
 
 
-def test_user_registration_schema():
-    user_data = UserRegistration(
-        name="Test User",
-        email="test@example.com",
-        password="password123",
-        company_name="Test Company"
-    )
-    
-    assert user_data.name == "Test User"
-    assert user_data.email == "test@example.com"
-    assert user_data.password == "password123"
-    assert user_data.company_name == "Test Company"
-
-
-def test_user_login_schema():
-    login_data = UserLoginCombined(
-        email="test@example.com",
-        password="password123"
-    )
-    assert login_data.email == "test@example.com"
-    assert login_data.password == "password123"
-
-
-def test_user_schema():
-    user = User(
-        id=1,
-        name="Test User",
-        username="testuser",
-        role="employee",
-        company_id=1,
-        division="Test Division",
-        is_active=True
-    )
-    
-    assert user.id == 1
-    assert user.name == "Test User"
-    assert user.username == "testuser"
-    assert user.role == "employee"
-    assert user.company_id == 1
-    assert user.division == "Test Division"
-    assert user.is_active
-
-
-def test_company_schema():
-    company = Company(
-        id=1,
-        name="Test Company",
-        code="TESTCO",
-        is_active=True
-    )
-    assert company.id == 1
-    assert company.name == "Test Company"
-    assert company.is_active
-
-
-def test_document_create_schema():
-    doc_create = DocumentCreate(
-        title="Test Document",
-        company_id=1,
-        temp_storage_path="/tmp/test_document.pdf",
+# Fixed values so schema fixtures are identical across runs.
+_FIXED_TS = datetime(2025, 1, 1, tzinfo=timezone.utc)
+_CONVERSATION_ID = uuid.UUID(int=1)
+
+_USER_DATA = dict(
+    id=1,
+    name="Test User",
+    username="testuser",
+    role="employee",
+    company_id=1,
+    division="Test Division",
+    is_active=True
+)
+
+_CHATLOG_DATA = dict(
+    question="Test question?",
+    answer="Test answer.",
+    UsersId=1,
+    company_id=1,
+    conversation_id=_CONVERSATION_ID
+)
+
+
+@pytest.mark.parametrize("schema, data", [
+    pytest.param(UserRegistration, dict(
+        name="Test User", email="test@example.com", password="password123", company_name="Test Company"
+    ), id="user_registration"),
+    pytest.param(UserLoginCombined, dict(email="test@example.com", password="password123"), id="user_login"),
+    pytest.param(User, _USER_DATA, id="user"),
+    pytest.param(Company, dict(
+        id=1, name="Test Company", code="TESTCO", is_active=True
+    ), id="company"),
+    pytest.param(DocumentCreate, dict(
+        title="Test Document", company_id=1, temp_storage_path="/tmp/test_document.pdf",
         content_type="application/pdf"
-    )
-    assert doc_create.title == "Test Document"
-    assert doc_create.company_id == 1
-    assert doc_create.content_type == "application/pdf"
-
-
-def test_document_schema():
-    doc = Document(
-        id=1,
-        title="Test Document",
-        company_id=1,
-        status=DocumentStatus.UPLOADED,
-        content_type="application/pdf"
-    )
-    
-    assert doc.id == 1
-    assert doc.title == "Test Document"
-    assert doc.company_id == 1
-    assert doc.status == DocumentStatus.UPLOADED
-    assert doc.content_type == "application/pdf"
-
-
-def test_chatlog_create_schema():
-    test_uuid = uuid.uuid4()
-    chatlog_create = ChatlogCreate(
-        question="Test question?",
-        answer="Test answer.",
-        UsersId=1,
-        company_id=1,
-        conversation_id=test_uuid
-    )
-    
-    assert chatlog_create.question == "Test question?"
-    assert chatlog_create.answer == "Test answer."
-    assert chatlog_create.UsersId == 1
-    assert chatlog_create.company_id == 1
-    assert chatlog_create.conversation_id == test_uuid
-
-
-def test_chatlog_schema():
-    test_uuid = uuid.uuid4()
-    chatlog = Chatlog(
-        id=1,
-        question="Test question?",
-        answer="Test answer.",
-        UsersId=1,
-        company_id=1,
-        conversation_id=test_uuid,
-        created_at=datetime.utcnow()
-    )
-    
-    assert chatlog.id == 1
-    assert chatlog.question == "Test question?"
-    assert chatlog.answer == "Test answer."
-    assert chatlog.UsersId == 1
-    assert chatlog.company_id == 1
-    assert chatlog.conversation_id == test_uuid
-
-
-def test_token_schema():
-    user_mock = User(
-        id=1,
-        name="Test User",
-        username="testuser",
-        role="employee",
-        company_id=1,
-        division="Test Division",
-        is_active=True
-    )
-
-    token = Token(
-        access_token="test_access_token",
-        token_type="bearer",
-        expires_in=3600,
-        user=user_mock
-    )
-    
-    assert token.access_token == "test_access_token"
-    assert token.token_type == "bearer"
-
-
-def test_chat_request_schema():
-    chat_request = ChatRequest(
-        message="Hello, how are you?",
-        conversation_id="test_conversation"
-    )
-    
-    assert chat_request.message == "Hello, how are you?"
-    assert chat_request.conversation_id == "test_conversation"
+    ), id="document_create"),
+    pytest.param(Document, dict(
+        id=1, title="Test Document", company_id=1, status=DocumentStatus.UPLOADED, content_type="application/pdf"
+    ), id="document"),
+    pytest.param(ChatlogCreate, _CHATLOG_DATA, id="chatlog_create"),
+    pytest.param(Chatlog, dict(_CHATLOG_DATA, id=1, created_at=_FIXED_TS), id="chatlog"),
+    pytest.param(Token, dict(
+        access_token="test_access_token", token_type="bearer", expires_in=3600,
+        user=_USER_DATA
+    ), id="token"),
+    pytest.param(ChatRequest, dict(
+        message="Hello, how are you?", conversation_id="test_conversation"
+    ), id="chat_request"),
+])
+def test_schema_roundtrip(schema, data):
+    obj = schema.model_validate(data)
+
+    assert obj.model_dump(exclude_unset=True) == data
+
+
+def test_user_validation():
+    user = User(**{**_USER_DATA, "id": "1"})
+
+    assert user.id == 1
+    assert user.model_dump(include=set(_USER_DATA)) == _USER_DATA
+
+
+def test_referenced_document_excludes_s3_path():
+    # Conversation details are built from ReferencedDocument, so the schema alone decides what is emitted.
+    assert "s3_path" not in ReferencedDocument.model_fields
+
+
+def test_chatlog_schema_json_roundtrip():
+    chatlog = Chatlog(**_CHATLOG_DATA, id=1, created_at=_FIXED_TS)
+
+    assert Chatlog.model_validate_json(orjson.dumps(chatlog.model_dump(mode="json"))) == chatlog
+
+
+def test_company_conversation_list_adapter():
+    rows = [
+        SimpleNamespace(id=uuid.uuid4(), title=f"Conversation {i}", is_archived=False, created_at=_FIXED_TS)
+        for i in range(3)
+    ]
+
+    conversations = CompanyConversationListAdapter.validate_python(rows, from_attributes=True)
+
+    assert [c.conversation_id for c in conversations] == [row.id for row in rows]
+    assert [c.title for c in conversations] == ["Conversation 0", "Conversation 1", "Conversation 2"]
@@ -1,8 +1,12 @@
+import httpx
 import pytest
-from unittest.mock import patch
+from fastapi import HTTPException
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.modules.documents.rag_service import RAGService
-from app.modules.chat.together_service import TogetherService
+from app.modules.chat.together_service import HTTP_LIMITS, HTTP_TIMEOUT, TogetherService
 from app.modules.auth.service import authenticate_user, register_user
+from app.modules.payment import service as payment_service
 from app.models.user_model import Users
 from app.models.company_model import Company
 from app.schemas.user_schema import UserRegistration
@@ -18,68 +22,119 @@ def test_together_service_initialization():
     assert llm_service is not None
 
 
-@pytest.mark.asyncio
-async def test_authenticate_user_success(mock_db_session):
+async def test_together_service_reuses_http_client(mock_db_session, mock_employee_user):
+    async def lines():
+        yield 'data: {"choices": [{"delta": {"content": "ok"}}]}'
+        yield "data: [DONE]"
+
+    llm_service = TogetherService()
+    mock_db_session.get.return_value = None
+    with patch("app.modules.chat.together_service.httpx.AsyncClient", autospec=True) as client_cls:
+        stream = client_cls.return_value.stream.return_value
+        stream.__aenter__.return_value = MagicMock(aiter_lines=lines)
+        for _ in range(3):
+            chunks = [c async for c in llm_service.generate_chat_response("q", mock_db_session, mock_employee_user)]
+            assert chunks == ["ok"]
+        await llm_service.close()
+
+    client_cls.assert_called_once_with(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+    client_cls.return_value.aclose.assert_awaited_once()
+
+
+async def test_ipaymu_service_reuses_http_client():
+    ipaymu = payment_service.IPaymuService()
+    with patch("app.modules.payment.service.httpx.AsyncClient", autospec=True) as client_cls:
+        client_cls.return_value.post.return_value = MagicMock(
+            **{"json.return_value": {"Status": 200, "Success": True, "Data": {"TransactionId": 7}}}
+        )
+        for _ in range(2):
+            assert await ipaymu.fetch_transaction_detail("7") == {"TransactionId": 7}
+        await ipaymu.close()
+
+    client_cls.assert_called_once_with(limits=payment_service.HTTP_LIMITS)
+    assert client_cls.return_value.post.await_count == 2
+
+
+async def test_ipaymu_service_http_error_keeps_shared_client():
+    ipaymu = payment_service.IPaymuService()
+    user = SimpleNamespace(name="Admin", company=SimpleNamespace(company_email="billing@example.com"))
+    request = httpx.Request("POST", ipaymu.payment_url)
+    with patch("app.modules.payment.service.httpx.AsyncClient", autospec=True) as client_cls:
+        # Fail the way httpx does in production so the HTTPStatusError branch is exercised.
+        client_cls.return_value.post.return_value = MagicMock(**{"raise_for_status.side_effect": httpx.HTTPStatusError(
+            "Server error", request=request, response=httpx.Response(502, text="gateway down", request=request)
+        )})
+        for _ in range(2):
+            with pytest.raises(HTTPException) as exc_info:
+                await ipaymu.create_payment_link_for_transaction("ref-1", "Pro", 100000, user)
+            assert exc_info.value.status_code == 500
+            assert exc_info.value.detail == "HTTP error with iPaymu API: gateway down"
+        await ipaymu.close()
+
+    client_cls.assert_called_once()
+
+
+async def test_together_service_pool_timeout_is_reported(mock_db_session, mock_employee_user):
+    llm_service = TogetherService()
+    mock_db_session.get.return_value = None
+    with patch("app.modules.chat.together_service.httpx.AsyncClient", autospec=True) as client_cls:
+        client_cls.return_value.stream.return_value.__aenter__.side_effect = httpx.PoolTimeout("pool exhausted")
+        with pytest.raises(HTTPException) as exc_info:
+            [c async for c in llm_service.generate_chat_response("q", mock_db_session, mock_employee_user)]
+        await llm_service.close()
+
+    assert exc_info.value.status_code == 503
+
+
+_AUTH = "app.modules.auth.service"
+
+
+async def test_authenticate_user_success(mock_db_session, monkeypatch, hashed_test_password):
     # Mock user data
     company = Company(id=1, name="Test Company", is_active=True)
     user = Users(
         id=1,
         name="Test User",
         username="testuser",
-        password="hashed_password",
+        password=hashed_test_password,
         role="admin",
         company_id=1,
         is_active=True
     )
     user.company = company
-    
-    with patch('app.modules.auth.service.company_repository.get_company_by_email', return_value=company), \
-         patch('app.modules.auth.service.user_repository.get_first_admin_by_company', return_value=user), \
-         patch('app.utils.security.verify_password', return_value=True):
-        
-        result = await authenticate_user(mock_db_session, email="test@example.com", password="password123")
-        assert result == user
-
-
-@pytest.mark.asyncio
-async def test_authenticate_user_failure(mock_db_session):
-    with patch('app.modules.auth.service.company_repository.get_company_by_email', return_value=None):
-        result = await authenticate_user(mock_db_session, email="nonexistent@example.com", password="password123")
-        assert result is None
-
-
-@pytest.mark.asyncio
-async def test_register_user(mock_db_session):
-    user_data = UserRegistration(
-        name="New User",
-        email="newuser@example.com",
-        password="password123",
-        company_name="New Company"
-    )
-    
-    # Mock the user and company creation
-    new_user = Users(
-        id=1,
-        name=user_data.name,
-        username=user_data.email,
-        password="hashed_password",
-        role="admin", 
-        is_active=False
-    )
-    
-    new_company = Company(
-        id=1,
-        name=user_data.company_name,
-        is_active=False 
-    )
-    
-    with patch('app.modules.auth.service.user_repository.get_user_by_username', return_value=None), \
-         patch('app.modules.auth.service.user_repository.create_user', return_value=new_user), \
-         patch('app.modules.auth.service.company_repository.get_company_by_name', return_value=None), \
-         patch('app.modules.auth.service.company_repository.get_company_by_email', return_value=None), \
-         patch('app.utils.security.get_password_hash', return_value="hashed_password"):
-        
-        result = await register_user(mock_db_session, user_data=user_data)
-        assert result.username == user_data.email
-        assert result.role == "admin"
-        assert not result.is_active
+    monkeypatch.setattr(f"{_AUTH}.company_repository.get_company_by_email", AsyncMock(return_value=company))
+    monkeypatch.setattr(f"{_AUTH}.user_repository.get_first_admin_by_company", AsyncMock(return_value=user))
+
+    result = await authenticate_user(mock_db_session, email="test@example.com", password="password123")
+    assert result == user
+
+
+async def test_authenticate_user_failure(mock_db_session, monkeypatch):
+    monkeypatch.setattr(f"{_AUTH}.company_repository.get_company_by_email", AsyncMock(return_value=None))
+
+    result = await authenticate_user(mock_db_session, email="nonexistent@example.com", password="password123")
+    assert result is None
+
+
+# Read-only registration payload shared by the register tests.
+_REGISTRATION = UserRegistration(
+    name="New User",
+    email="newuser@example.com",
+    password="password123",
+    company_name="New Company"
+)
+
+
+async def test_register_user(mock_db_session, monkeypatch, hashed_test_password):
+    user_data = _REGISTRATION
+    monkeypatch.setattr(f"{_AUTH}.user_repository.get_user_by_username", AsyncMock(return_value=None))
+    monkeypatch.setattr(f"{_AUTH}.company_repository.get_company_by_name", AsyncMock(return_value=None))
+    monkeypatch.setattr(f"{_AUTH}.company_repository.get_company_by_email", AsyncMock(return_value=None))
+    monkeypatch.setattr(f"{_AUTH}.get_password_hash", MagicMock(return_value=hashed_test_password))
+    monkeypatch.setattr(f"{_AUTH}.subscription_service.create_trial_subscription", AsyncMock())
+
+    result = await register_user(mock_db_session, user_data=user_data)
+    assert result.username == user_data.email
+    assert result.role == "admin"
+    assert result.password == hashed_test_password
+    assert not result.is_active